@@ -144,3 +144,20 @@ BEGIN
         (SELECT COUNT(*) FROM kb_chunks WHERE embedding IS NULL);
 END;
 $$;
+
+-- Bulk embedding update: updates = [{"id": 1, "embedding": [...]}, ...]
+CREATE OR REPLACE FUNCTION kb_update_embeddings(updates JSONB)
+RETURNS INT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    updated_count INT;
+BEGIN
+    UPDATE kb_chunks c
+    SET embedding = (u->>'embedding')::vector
+    FROM jsonb_array_elements(updates) AS u
+    WHERE c.id = (u->>'id')::INT;
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$;
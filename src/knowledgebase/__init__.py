@@ -1,7 +1,7 @@
 """OpenClaw Knowledgebase - Self-hosted RAG with Ollama + Supabase."""
 
-from knowledgebase.client import KnowledgeBase
+from knowledgebase.client import KnowledgeBase, AsyncKnowledgeBase
 from knowledgebase.search import search, search_hybrid
 
 __version__ = "0.1.0"
-__all__ = ["KnowledgeBase", "search", "search_hybrid"]
+__all__ = ["KnowledgeBase", "AsyncKnowledgeBase", "search", "search_hybrid"]
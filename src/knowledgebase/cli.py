@@ -10,7 +10,6 @@ from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskPr
 from knowledgebase.config import get_config
 from knowledgebase.client import KnowledgeBase
 from knowledgebase.embeddings import get_embedding, test_ollama_connection
-from knowledgebase.embeddings_optimized import embed_chunks_parallel
 from knowledgebase.search import search, search_hybrid, format_results
 
 console = Console()
@@ -92,11 +91,15 @@ def find(query: str, limit: int, threshold: float, hybrid: bool):
 
 @main.command()
 @click.option("--batch-size", default=50, help="Chunks per batch")
-@click.option("--workers", "-w", default=4, help="Parallel workers (default: 4)")
+@click.option("--workers", "-w", default=None, type=int,
+              help="Parallel Ollama requests (default: EMBEDDING_CONCURRENCY)")
 @click.option("--sequential", is_flag=True, help="Use sequential processing (slower)")
-def embed(batch_size: int, workers: int, sequential: bool):
+def embed(batch_size: int, workers: int | None, sequential: bool):
     """Generate embeddings for chunks that don't have them."""
     config = get_config()
+    if workers:
+        # Sizes the shared embedding pool, which is created on first use
+        config.embedding_concurrency = workers
     kb = KnowledgeBase()
     
     # Check Ollama first
@@ -110,11 +113,12 @@ def embed(batch_size: int, workers: int, sequential: bool):
         console.print("[green]✅ All chunks have embeddings![/green]")
         return
     
-    mode = "sequential" if sequential else f"parallel ({workers} workers)"
+    mode = "sequential" if sequential else f"parallel ({config.embedding_concurrency} workers)"
     console.print(f"\n🧠 Generating embeddings for {total_without} chunks... [{mode}]\n")
     
     total_done = 0
-    total_errors = 0
+    # Chunks that failed to embed stay pending; skip them so the loop ends
+    skipped: set = set()
     start_time = time.time()
     
     with Progress(
@@ -127,41 +131,31 @@ def embed(batch_size: int, workers: int, sequential: bool):
         task = progress.add_task("Embedding...", total=total_without)
         
         while True:
-            chunks = kb.get_chunks_without_embeddings(limit=batch_size)
-            if not chunks:
-                break
-            
             if sequential:
-                # Original sequential processing
+                # One chunk at a time, saved in one bulk update per batch
+                chunks = kb.get_chunks_without_embeddings(limit=batch_size, exclude_ids=skipped)
+                if not chunks:
+                    break
+                updates = []
+                failed = []
                 for chunk in chunks:
                     embedding = get_embedding(chunk.content)
                     if embedding:
-                        kb.update_chunk_embedding(chunk.id, embedding)
-                        total_done += 1
+                        updates.append((chunk.id, embedding))
                     else:
-                        total_errors += 1
+                        failed.append(chunk.id)
                     progress.update(task, advance=1)
+                done = kb.update_chunk_embeddings_batch(updates)
             else:
-                # Parallel processing
-                chunk_dicts = [{'id': c.id, 'content': c.content} for c in chunks]
-                
-                def update_callback(chunk_id, embedding):
-                    kb.update_chunk_embedding(chunk_id, embedding)
-                
-                def progress_callback(done, total, text):
-                    progress.update(task, advance=1)
-                    elapsed = time.time() - start_time
-                    rate = (total_done + done) / elapsed if elapsed > 0 else 0
-                    progress.update(task, description=f"Embedding... ({rate:.1f}/s)")
-                
-                success, errors = embed_chunks_parallel(
-                    chunk_dicts,
-                    update_callback,
-                    max_workers=workers,
-                    on_progress=progress_callback,
-                )
-                total_done += success
-                total_errors += errors
+                # Batched /api/embed calls in parallel, identical texts embedded once
+                done, failed = kb.embed_pending(batch_size=batch_size, skip_ids=skipped)
+                progress.update(task, advance=done + len(failed))
+            
+            # Stop when a batch makes no progress (e.g. saving keeps failing)
+            if not done and not failed:
+                break
+            total_done += done
+            skipped.update(failed)
             
             # Update rate display
             elapsed = time.time() - start_time
@@ -170,8 +164,8 @@ def embed(batch_size: int, workers: int, sequential: bool):
     
     elapsed = time.time() - start_time
     console.print(f"\n[green]✅ Done![/green] {total_done} embeddings in {elapsed:.0f}s ({total_done/elapsed:.1f}/s)")
-    if total_errors:
-        console.print(f"[yellow]⚠️ {total_errors} chunks failed[/yellow]")
+    if skipped:
+        console.print(f"[yellow]⚠️ {len(skipped)} chunks failed[/yellow]")
 
 
 @main.command()
@@ -1,20 +1,115 @@
 """Supabase client for OpenClaw Knowledgebase."""
 
+import copy
 import time
+import hashlib
 import logging
+import threading
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from typing import Any, Iterator
+from typing import Any, Collection, Iterator, Sequence
 from dataclasses import dataclass
 
+import numpy as np
+import orjson
+
 from knowledgebase.config import get_config, Config
-from knowledgebase.embeddings import get_embedding
+from knowledgebase.embeddings import (
+    HAS_HTTP2,
+    HAS_HTTPX,
+    _async_client,
+    _require_httpx,
+    get_embedding,
+    get_embedding_async,
+    get_embeddings_batch,
+)
+from knowledgebase.query_cache import get_query_cache
+
+# httpx powers AsyncKnowledgeBase (probed once, in embeddings.py)
+if HAS_HTTPX:
+    import httpx
 
 logger = logging.getLogger(__name__)
 
+# Pooled sessions shared by all KnowledgeBase instances, keyed by (url, headers).
+# search() and the web routes build a KnowledgeBase per call, so a
+# per-instance session would never get to reuse a keep-alive connection.
+_sessions: dict[tuple, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def _get_shared_session(rest_url: str, headers: dict[str, str]) -> requests.Session:
+    """Get the shared Supabase session (with retry logic) for a project."""
+    key = (rest_url, tuple(sorted(headers.items())))
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(headers)
+            retry_strategy = Retry(
+                total=3,
+                backoff_factor=2,
+                status_forcelist=[408, 429, 500, 502, 503, 504],
+                respect_retry_after_header=True,
+                allowed_methods=["HEAD", "GET", "POST", "PATCH", "DELETE", "PUT"],
+            )
+            adapter = HTTPAdapter(
+                max_retries=retry_strategy,
+                pool_connections=4,
+                pool_maxsize=32,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[key] = session
+        return session
+
+
+def _as_vector(value: Any) -> np.ndarray | None:
+    """Convert an embedding from the API (list or "[0.1,...]" string) to float32."""
+    if value is None or isinstance(value, np.ndarray):
+        return value
+    try:
+        if isinstance(value, str):
+            value = value.strip("[]").split(",")
+        vector = np.array(value, dtype=np.float32)
+    except ValueError:
+        return None
+    return vector if vector.ndim == 1 and vector.size else None
+
+
+def _json_vector(embedding: Sequence[float]) -> list[float] | np.ndarray:
+    """Make an embedding (list, array.array or ndarray) serializable by _dumps."""
+    if isinstance(embedding, np.ndarray):
+        return np.ascontiguousarray(embedding)
+    return embedding if isinstance(embedding, list) else list(embedding)
+
 
-@dataclass
+def _copy_chunks(chunks: Sequence["Chunk"]) -> list["Chunk"]:
+    """Deep-copy chunks so callers can't mutate results held by the query cache."""
+    return copy.deepcopy(list(chunks))
+
+
+def _semantic_cache_params(rest_url: str, prefix: str, limit: int, threshold: float) -> tuple:
+    """Query-cache params for a semantic search (shared by sync and async clients)."""
+    return ("semantic", rest_url, prefix, limit, threshold)
+
+
+def _hybrid_cache_params(
+    rest_url: str, prefix: str, limit: int, semantic_weight: float, query: str
+) -> tuple:
+    """Query-cache params for a hybrid search (shared by sync and async clients)."""
+    # The keyword half depends on the exact words, not just the embedding
+    query_key = " ".join(query.lower().split())
+    return ("hybrid", rest_url, prefix, limit, semantic_weight, query_key)
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize a request body with orjson (ndarrays are written natively)."""
+    return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+@dataclass(slots=True)
 class Source:
     """A knowledge source (URL or document)."""
     id: int | str  # Can be int or UUID depending on schema
@@ -32,7 +127,7 @@ class Source:
             self.metadata = {}
 
 
-@dataclass
+@dataclass(slots=True)
 class Chunk:
     """A text chunk with optional embedding."""
     id: int | str  # Can be int or UUID
@@ -40,7 +135,7 @@ class Chunk:
     content: str
     chunk_index: int = 0  # Archon schema uses chunk_index
     metadata: dict | None = None
-    embedding: list[float] | None = None
+    embedding: Sequence[float] | None = None  # float32 ndarray when read from the API
     similarity: float | None = None
     # Optional fields from search results (joined from source)
     url: str | None = None
@@ -66,25 +161,21 @@ class KnowledgeBase:
         # Table names with configurable prefix
         self._sources_table = f"{self.config.table_prefix}_sources"
         self._chunks_table = f"{self.config.table_prefix}_chunks"
+        # Endpoint URLs, built once instead of per call
+        self._rest_url = f"{self.config.supabase_url}/rest/v1"
+        rpc_prefix = f"{self._rest_url}/rpc/{self.config.table_prefix}"
+        self._rpc_search_semantic = f"{rpc_prefix}_search_semantic"
+        self._rpc_search_hybrid = f"{rpc_prefix}_search_hybrid"
+        self._rpc_stats = f"{rpc_prefix}_stats"
+        self._rpc_match_documents = f"{self._rest_url}/rpc/match_documents"
+        self._rpc_update_embeddings = f"{rpc_prefix}_update_embeddings"
+        # Process-wide session so every call reuses pooled keep-alive connections
+        self._session = _get_shared_session(self._rest_url, self._headers)
+        # Proximity cache of search results (shared across instances)
+        self._query_cache = get_query_cache()
 
     def _get_session(self) -> requests.Session:
-        """Get a requests session with retry logic."""
-        if not hasattr(self, '_session') or self._session is None:
-            self._session = requests.Session()
-            retry_strategy = Retry(
-                total=3,
-                backoff_factor=2,
-                status_forcelist=[408, 429, 500, 502, 503, 504],
-                respect_retry_after_header=True,
-                allowed_methods=["GET", "POST", "PATCH", "DELETE", "PUT"],
-            )
-            adapter = HTTPAdapter(
-                max_retries=retry_strategy,
-                pool_connections=5,
-                pool_maxsize=10,
-            )
-            self._session.mount("http://", adapter)
-            self._session.mount("https://", adapter)
+        """Get the shared requests session with retry logic."""
         return self._session
 
     def _request(
@@ -96,19 +187,19 @@ class KnowledgeBase:
         return_representation: bool = False,
     ) -> requests.Response:
         """Make a request to Supabase REST API with retry logic."""
-        url = f"{self.config.supabase_url}/rest/v1/{endpoint}"
-        headers = dict(self._headers)
+        url = f"{self._rest_url}/{endpoint}"
+        headers = None
 
         # For POST/PATCH, request the created/updated row back
         if return_representation and method in ("POST", "PATCH"):
-            headers["Prefer"] = "return=representation"
+            headers = {"Prefer": "return=representation"}
 
         session = self._get_session()
         return session.request(
             method,
             url,
             headers=headers,
-            json=data,
+            data=_dumps(data) if data is not None else None,
             params=params,
             timeout=60,
         )
@@ -133,7 +224,7 @@ class KnowledgeBase:
         resp = self._request("POST", self._sources_table, data=data, return_representation=True)
         if resp.status_code == 201:
             try:
-                result = resp.json()
+                result = orjson.loads(resp.content)
                 if result:
                     row = result[0] if isinstance(result, list) else result
                     known_fields = {"id", "url", "title", "source_type", "metadata", "description", "created_at", "updated_at"}
@@ -147,7 +238,7 @@ class KnowledgeBase:
         """Get a source by URL."""
         resp = self._request("GET", self._sources_table, params={"url": f"eq.{url}"})
         if resp.status_code == 200:
-            result = resp.json()
+            result = orjson.loads(resp.content)
             if result:
                 s = result[0]
                 known_fields = {"id", "url", "title", "source_type", "metadata", "description", "created_at", "updated_at"}
@@ -159,7 +250,7 @@ class KnowledgeBase:
         """Get a source by ID."""
         resp = self._request("GET", self._sources_table, params={"id": f"eq.{source_id}"})
         if resp.status_code == 200:
-            result = resp.json()
+            result = orjson.loads(resp.content)
             if result:
                 s = result[0]
                 known_fields = {"id", "url", "title", "source_type", "metadata", "description", "created_at", "updated_at"}
@@ -175,7 +266,7 @@ class KnowledgeBase:
         })
         if resp.status_code == 200:
             sources = []
-            for s in resp.json():
+            for s in orjson.loads(resp.content):
                 # Filter to known fields only
                 known_fields = {"id", "url", "title", "source_type", "metadata", "description", "created_at", "updated_at"}
                 filtered = {k: v for k, v in s.items() if k in known_fields}
@@ -191,7 +282,7 @@ class KnowledgeBase:
         content: str,
         chunk_index: int = 0,
         metadata: dict | None = None,
-        embedding: list[float] | None = None,
+        embedding: Sequence[float] | None = None,
         # Legacy params (ignored but accepted for compatibility)
         url: str | None = None,
         chunk_number: int | None = None,
@@ -213,10 +304,11 @@ class KnowledgeBase:
             data["url"] = url
         if title:
             data["title"] = title
-        if embedding:
-            data["embedding"] = embedding
+        if embedding is not None and len(embedding):
+            data["embedding"] = _json_vector(embedding)
 
         resp = self._request("POST", self._chunks_table, data=data)
+        self._query_cache.clear()
         return resp.status_code == 201
 
     def add_chunks_batch(self, chunks: list[dict]) -> int:
@@ -225,16 +317,23 @@ class KnowledgeBase:
             return 0
 
         resp = self._request("POST", self._chunks_table, data=chunks)
+        self._query_cache.clear()
         if resp.status_code in (200, 201):
             return len(chunks)
         return 0
 
-    def get_chunks_without_embeddings(self, limit: int = 50, source_id: int | str | None = None) -> list[Chunk]:
+    def get_chunks_without_embeddings(
+        self,
+        limit: int = 50,
+        source_id: int | str | None = None,
+        exclude_ids: Collection[int | str] | None = None,
+    ) -> list[Chunk]:
         """Get chunks that need embeddings.
 
         Args:
             limit: Max chunks to return
             source_id: Optional source id to filter by
+            exclude_ids: Chunk ids to leave out (e.g. ones that failed to embed)
         """
         params = {
             "embedding": "is.null",
@@ -243,11 +342,13 @@ class KnowledgeBase:
         }
         if source_id is not None:
             params["source_id"] = f"eq.{source_id}"
+        if exclude_ids:
+            params["id"] = f"not.in.({','.join(str(i) for i in exclude_ids)})"
 
         resp = self._request("GET", self._chunks_table, params=params)
         if resp.status_code == 200:
             chunks: list[Chunk] = []
-            for c in resp.json():
+            for c in orjson.loads(resp.content):
                 chunks.append(
                     Chunk(
                         id=c["id"],
@@ -262,16 +363,115 @@ class KnowledgeBase:
         return []
 
 
-    def update_chunk_embedding(self, chunk_id: int | str, embedding: list[float]) -> bool:
+    def update_chunk_embedding(self, chunk_id: int | str, embedding: Sequence[float]) -> bool:
         """Update a chunk's embedding."""
         resp = self._request(
             "PATCH",
             self._chunks_table,
-            data={"embedding": embedding},
+            data={"embedding": _json_vector(embedding)},
             params={"id": f"eq.{chunk_id}"},
         )
+        self._query_cache.clear()
         return resp.status_code in (200, 204)
 
+    def update_chunk_embeddings_batch(
+        self,
+        updates: list[tuple[int | str, Sequence[float]]],
+        batch_size: int = 500,
+    ) -> int:
+        """
+        Update many chunk embeddings with as few requests as possible.
+
+        Uses the {prefix}_update_embeddings RPC (one UPDATE per `batch_size`
+        rows). A plain PostgREST upsert can't be used here because the NOT NULL
+        columns of kb_chunks would have to be resent. Falls back to one PATCH
+        per chunk if the RPC isn't installed.
+
+        Args:
+            updates: (chunk_id, embedding) pairs
+            batch_size: Max rows per request (keeps payloads under PostgREST limits)
+
+        Returns:
+            Number of chunks updated
+        """
+        updated = 0
+        for i in range(0, len(updates), batch_size):
+            batch = updates[i:i + batch_size]
+            rows = [{"id": chunk_id, "embedding": _json_vector(emb)} for chunk_id, emb in batch]
+            resp = self._get_session().post(
+                self._rpc_update_embeddings,
+                data=_dumps({"updates": rows}),
+                timeout=60,
+            )
+            self._query_cache.clear()
+            if resp.status_code == 200:
+                updated += int(orjson.loads(resp.content) or 0)
+                continue
+
+            # Fallback: one PATCH per chunk
+            updated += sum(
+                1 for chunk_id, emb in batch if self.update_chunk_embedding(chunk_id, emb)
+            )
+        return updated
+
+    def embed_pending(
+        self,
+        batch_size: int = 50,
+        source_id: int | str | None = None,
+        skip_ids: Collection[int | str] | None = None,
+    ) -> tuple[int, list[int | str]]:
+        """
+        Embed one batch of chunks that have no embedding yet.
+
+        Chunks with identical content share a single embedding: each distinct
+        text is embedded once and written to all of its chunks, and the whole
+        batch is saved via update_chunk_embeddings_batch.
+
+        Chunks that can't be embedded (empty text, Ollama errors) stay
+        pending in the database, so callers looping over this should pass
+        the failed ids back in `skip_ids` to get past them.
+
+        Args:
+            batch_size: Max chunks to fetch and embed
+            source_id: Optional source id to filter by
+            skip_ids: Chunk ids to leave out of the batch
+
+        Returns:
+            Tuple of (chunks updated, ids of chunks that failed to embed)
+
+        Example:
+            >>> skipped = set()
+            >>> while True:
+            ...     done, failed = kb.embed_pending(skip_ids=skipped)
+            ...     if not done and not failed:
+            ...         break
+            ...     skipped.update(failed)
+        """
+        chunks = self.get_chunks_without_embeddings(
+            limit=batch_size, source_id=source_id, exclude_ids=skip_ids
+        )
+        if not chunks:
+            return 0, []
+
+        # Group chunk ids by content hash
+        groups: dict[bytes, list[Chunk]] = {}
+        for chunk in chunks:
+            digest = hashlib.sha256(chunk.content.encode()).digest()
+            groups.setdefault(digest, []).append(chunk)
+
+        unique = list(groups.values())
+        embeddings = get_embeddings_batch([group[0].content for group in unique])
+
+        updates = []
+        failed = []
+        for group, embedding in zip(unique, embeddings):
+            for chunk in group:
+                if embedding:
+                    updates.append((chunk.id, embedding))
+                else:
+                    failed.append(chunk.id)
+        return self.update_chunk_embeddings_batch(updates), failed
+
     def count_chunks(self, with_embeddings: bool | None = None) -> int:
         """Count chunks, optionally filtered by embedding status."""
         params = {"select": "id"}
@@ -280,20 +480,12 @@ class KnowledgeBase:
         elif with_embeddings is False:
             params["embedding"] = "is.null"
 
-        resp = self._request(
-            "GET",
-            self._chunks_table,
-            params={**params, "limit": "1"},
-        )
-        resp.headers.get("content-range", "0-0/0")
-
-        # Use HEAD with Prefer: count=exact for accurate count
-        headers = {**self._headers, "Prefer": "count=exact"}
-        resp = requests.head(
-            f"{self.config.supabase_url}/rest/v1/{self._chunks_table}",
-            headers=headers,
+        # HEAD with Prefer: count=exact returns the count in Content-Range alone
+        resp = self._get_session().head(
+            f"{self._rest_url}/{self._chunks_table}",
+            headers={"Prefer": "count=exact"},
             params=params,
-            timeout=60,
+            timeout=10,
         )
 
         content_range = resp.headers.get("content-range", "0-0/0")
@@ -305,12 +497,14 @@ class KnowledgeBase:
     def delete_chunks_by_source(self, source_id: int | str) -> bool:
         """Delete all chunks for a given source."""
         resp = self._request("DELETE", self._chunks_table, params={"source_id": f"eq.{source_id}"})
+        self._query_cache.clear()
         return resp.status_code in (200, 204)
 
 
     def delete_source_by_id(self, source_id: int | str) -> bool:
         """Delete a source by id."""
         resp = self._request("DELETE", self._sources_table, params={"id": f"eq.{source_id}"})
+        self._query_cache.clear()
         return resp.status_code in (200, 204)
 
 
@@ -340,20 +534,39 @@ class KnowledgeBase:
         limit = limit or self.config.default_match_count
         threshold = threshold or self.config.similarity_threshold
 
+        cache_params = _semantic_cache_params(
+            self._rest_url, self.config.table_prefix, limit, threshold
+        )
+        cached = self._query_cache.lookup(embedding, cache_params)
+        if cached is not None:
+            return _copy_chunks(cached)
+
+        results = self._search_semantic_uncached(embedding, limit, threshold)
+        # Empty lists are also what the error fallbacks return, so never cache them
+        if results:
+            self._query_cache.insert(embedding, cache_params, tuple(_copy_chunks(results)))
+        return results
+
+    def _search_semantic_uncached(
+        self,
+        embedding: Sequence[float],
+        limit: int,
+        threshold: float,
+    ) -> list[Chunk]:
+        """Run the semantic search RPCs (with fallbacks) for an embedding."""
         # Try RPC function first (for schemas that have it)
-        resp = requests.post(
-            f"{self.config.supabase_url}/rest/v1/rpc/{self.config.table_prefix}_search_semantic",
-            headers=self._headers,
-            json={
+        resp = self._get_session().post(
+            self._rpc_search_semantic,
+            data=_dumps({
                 "query_embedding": embedding,
                 "match_count": limit,
                 "similarity_threshold": threshold,
-            },
+            }),
             timeout=60,
         )
 
         if resp.status_code == 200:
-            results = resp.json()
+            results = orjson.loads(resp.content)
             if results:  # Only use if we got results
                 return [
                     Chunk(
@@ -363,6 +576,7 @@ class KnowledgeBase:
                         chunk_index=r.get("chunk_index", 0),
                         url=r.get("url"),
                         title=r.get("title"),
+                        embedding=_as_vector(r.get("embedding")),
                         similarity=r.get("similarity"),
                     )
                     for r in results
@@ -370,19 +584,18 @@ class KnowledgeBase:
 
         # Fallback: direct vector search using match_documents function
         # This is a simpler function that just does cosine similarity
-        fallback_resp = requests.post(
-            f"{self.config.supabase_url}/rest/v1/rpc/match_documents",
-            headers=self._headers,
-            json={
+        fallback_resp = self._get_session().post(
+            self._rpc_match_documents,
+            data=_dumps({
                 "query_embedding": embedding,
                 "match_count": limit,
                 "filter": {},
-            },
+            }),
             timeout=60,
         )
 
         if fallback_resp.status_code == 200:
-            results = fallback_resp.json()
+            results = orjson.loads(fallback_resp.content)
             if results:
                 return [
                     Chunk(
@@ -390,6 +603,7 @@ class KnowledgeBase:
                         source_id=r.get("source_id", ""),
                         content=r.get("content", ""),
                         chunk_index=r.get("chunk_index", 0),
+                        embedding=_as_vector(r.get("embedding")),
                         similarity=r.get("similarity"),
                     )
                     for r in results
@@ -422,21 +636,26 @@ class KnowledgeBase:
         limit = limit or self.config.default_match_count
         semantic_weight = semantic_weight or self.config.semantic_weight
 
-        resp = requests.post(
-            f"{self.config.supabase_url}/rest/v1/rpc/{self.config.table_prefix}_search_hybrid",
-            headers=self._headers,
-            json={
+        cache_params = _hybrid_cache_params(
+            self._rest_url, self.config.table_prefix, limit, semantic_weight, query
+        )
+        cached = self._query_cache.lookup(embedding, cache_params)
+        if cached is not None:
+            return _copy_chunks(cached)
+
+        resp = self._get_session().post(
+            self._rpc_search_hybrid,
+            data=_dumps({
                 "query_embedding": embedding,
                 "query_text": query,
                 "match_count": limit,
                 "semantic_weight": semantic_weight,
-            },
+            }),
             timeout=60,
         )
 
         if resp.status_code == 200:
-            results = resp.json()
-            return [
+            results = [
                 Chunk(
                     id=r["id"],
                     source_id=r.get("source_id", ""),
@@ -444,10 +663,14 @@ class KnowledgeBase:
                     chunk_index=r.get("chunk_index", 0),
                     url=r.get("url"),
                     title=r.get("title"),
+                    embedding=_as_vector(r.get("embedding")),
                     similarity=r.get("combined_score"),
                 )
-                for r in results
+                for r in orjson.loads(resp.content)
             ]
+            if results:
+                self._query_cache.insert(embedding, cache_params, tuple(_copy_chunks(results)))
+            return results
         return []
 
     # --- Stats ---
@@ -455,15 +678,14 @@ class KnowledgeBase:
     def stats(self) -> dict:
         """Get knowledgebase statistics."""
         # Try RPC function first
-        resp = requests.post(
-            f"{self.config.supabase_url}/rest/v1/rpc/{self.config.table_prefix}_stats",
-            headers=self._headers,
-            json={},
+        resp = self._get_session().post(
+            self._rpc_stats,
+            data=_dumps({}),
             timeout=60,
         )
 
         if resp.status_code == 200:
-            result = resp.json()
+            result = orjson.loads(resp.content)
             if result:
                 return result[0] if isinstance(result, list) else result
 
@@ -480,7 +702,7 @@ class KnowledgeBase:
 
     def _search_vector_direct(
         self,
-        query_embedding: list[float],
+        query_embedding: Sequence[float],
         limit: int = 10,
         threshold: float = 0.5,
     ) -> list[Chunk]:
@@ -489,17 +711,6 @@ class KnowledgeBase:
         Fetches chunks and computes similarity client-side.
         Note: This is slower than using a proper pgvector function.
         """
-        import math
-
-        def cosine_similarity(a: list[float], b: list[float]) -> float:
-            """Compute cosine similarity between two vectors."""
-            dot = sum(x * y for x, y in zip(a, b))
-            norm_a = math.sqrt(sum(x * x for x in a))
-            norm_b = math.sqrt(sum(x * x for x in b))
-            if norm_a == 0 or norm_b == 0:
-                return 0
-            return dot / (norm_a * norm_b)
-
         # Fetch chunks with embeddings (limited to avoid memory issues)
         # This is a fallback, so we accept some limitations
         resp = self._request(
@@ -515,44 +726,251 @@ class KnowledgeBase:
         if resp.status_code != 200:
             return []
 
-        chunks_data = resp.json()
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+        if query_norm == 0:
+            return []
 
-        # Compute similarities
-        results = []
-        for c in chunks_data:
-            emb = c.get("embedding")
-            if not emb:
+        # Parse embeddings (Supabase returns vectors as strings) into one matrix
+        rows = []
+        vectors = []
+        for c in orjson.loads(resp.content):
+            emb = _as_vector(c.get("embedding"))
+            if emb is None or emb.shape != query.shape:
                 continue
+            rows.append(c)
+            vectors.append(emb)
+
+        if not rows:
+            return []
+
+        matrix = np.stack(vectors)
+        norms = np.linalg.norm(matrix, axis=1) * query_norm
+        sims = np.divide(
+            matrix @ query, norms, out=np.zeros(len(rows), dtype=np.float32), where=norms != 0
+        )
+
+        # Top N above threshold, by similarity descending
+        order = [i for i in np.argsort(-sims, kind="stable") if sims[i] >= threshold][:limit]
 
-            # Parse embedding if it's a string (Supabase returns vectors as strings)
-            if isinstance(emb, str):
-                # Format: "[0.1,0.2,...]"
-                try:
-                    emb = [float(x) for x in emb.strip("[]").split(",")]
-                except:
-                    continue
-
-            sim = cosine_similarity(query_embedding, emb)
-            if sim >= threshold:
-                results.append({
-                    "id": c["id"],
-                    "source_id": c["source_id"],
-                    "content": c["content"],
-                    "chunk_index": c.get("chunk_index", 0),
-                    "similarity": sim,
-                })
-
-        # Sort by similarity descending
-        results.sort(key=lambda x: x["similarity"], reverse=True)
-
-        # Return top N
         return [
             Chunk(
-                id=r["id"],
-                source_id=r["source_id"],
-                content=r["content"],
-                chunk_index=r["chunk_index"],
-                similarity=r["similarity"],
+                id=rows[i]["id"],
+                source_id=rows[i]["source_id"],
+                content=rows[i]["content"],
+                chunk_index=rows[i].get("chunk_index", 0),
+                embedding=vectors[i],
+                similarity=float(sims[i]),
             )
-            for r in results[:limit]
+            for i in order
         ]
+
+
+class AsyncKnowledgeBase:
+    """
+    Async client for the hot paths (batch inserts, embedding updates, search).
+
+    Opt-in mirror of KnowledgeBase built on httpx.AsyncClient; requests are
+    multiplexed over HTTP/2 when h2 is installed. Requires the `async` extra.
+
+    Example:
+        >>> async with AsyncKnowledgeBase() as kb:
+        ...     chunks = await kb.search_semantic_async("home assistant automations")
+    """
+
+    def __init__(self, config: Config | None = None):
+        """Initialize with optional config (uses global config if not provided)."""
+        _require_httpx()
+
+        self.config = config or get_config()
+        self._headers = {
+            "apikey": self.config.supabase_key,
+            "Authorization": f"Bearer {self.config.supabase_key}",
+            "Content-Type": "application/json",
+        }
+        self._sources_table = f"{self.config.table_prefix}_sources"
+        self._chunks_table = f"{self.config.table_prefix}_chunks"
+        self._rest_url = f"{self.config.supabase_url}/rest/v1"
+        self._client = httpx.AsyncClient(
+            base_url=f"{self._rest_url}/",
+            headers=self._headers,
+            http2=HAS_HTTP2,
+            timeout=60.0,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        )
+        # Long-lived Ollama client so query embeddings reuse pooled connections
+        self._ollama = _async_client(timeout=120.0)
+        # Proximity cache of search results (shared with KnowledgeBase)
+        self._query_cache = get_query_cache()
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pools."""
+        await self._client.aclose()
+        await self._ollama.aclose()
+
+    async def __aenter__(self) -> "AsyncKnowledgeBase":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    # --- Chunks ---
+
+    async def add_chunks_batch_async(self, chunks: list[dict]) -> int:
+        """Add multiple chunks at once. Returns number added."""
+        if not chunks:
+            return 0
+
+        resp = await self._client.post(self._chunks_table, content=_dumps(chunks))
+        self._query_cache.clear()
+        if resp.status_code in (200, 201):
+            return len(chunks)
+        return 0
+
+    async def update_chunk_embedding_async(
+        self, chunk_id: int | str, embedding: Sequence[float]
+    ) -> bool:
+        """Update a chunk's embedding."""
+        resp = await self._client.patch(
+            self._chunks_table,
+            content=_dumps({"embedding": _json_vector(embedding)}),
+            params={"id": f"eq.{chunk_id}"},
+        )
+        self._query_cache.clear()
+        return resp.status_code in (200, 204)
+
+    # --- Search ---
+
+    async def search_semantic_async(
+        self,
+        query: str,
+        limit: int | None = None,
+        threshold: float | None = None,
+    ) -> list[Chunk]:
+        """Semantic search using vector similarity (see KnowledgeBase.search_semantic)."""
+        embedding = await get_embedding_async(query, client=self._ollama)
+        if not embedding:
+            return []
+
+        limit = limit or self.config.default_match_count
+        threshold = threshold or self.config.similarity_threshold
+
+        cache_params = _semantic_cache_params(
+            self._rest_url, self.config.table_prefix, limit, threshold
+        )
+        cached = self._query_cache.lookup(embedding, cache_params)
+        if cached is not None:
+            return _copy_chunks(cached)
+
+        results = await self._search_semantic_uncached_async(embedding, limit, threshold)
+        # Empty lists are also what the error fallbacks return, so never cache them
+        if results:
+            self._query_cache.insert(embedding, cache_params, tuple(_copy_chunks(results)))
+        return results
+
+    async def _search_semantic_uncached_async(
+        self,
+        embedding: Sequence[float],
+        limit: int,
+        threshold: float,
+    ) -> list[Chunk]:
+        """Run the semantic search RPCs (with fallback) for an embedding."""
+        resp = await self._client.post(
+            f"rpc/{self.config.table_prefix}_search_semantic",
+            content=_dumps({
+                "query_embedding": embedding,
+                "match_count": limit,
+                "similarity_threshold": threshold,
+            }),
+        )
+
+        if resp.status_code == 200:
+            results = orjson.loads(resp.content)
+            if results:
+                return [
+                    Chunk(
+                        id=r["id"],
+                        source_id=r.get("source_id", ""),
+                        content=r["content"],
+                        chunk_index=r.get("chunk_index", 0),
+                        url=r.get("url"),
+                        title=r.get("title"),
+                        embedding=_as_vector(r.get("embedding")),
+                        similarity=r.get("similarity"),
+                    )
+                    for r in results
+                ]
+
+        # Fallback: generic match_documents function
+        fallback_resp = await self._client.post(
+            "rpc/match_documents",
+            content=_dumps({
+                "query_embedding": embedding,
+                "match_count": limit,
+                "filter": {},
+            }),
+        )
+
+        if fallback_resp.status_code == 200:
+            return [
+                Chunk(
+                    id=r.get("id", 0),
+                    source_id=r.get("source_id", ""),
+                    content=r.get("content", ""),
+                    chunk_index=r.get("chunk_index", 0),
+                    embedding=_as_vector(r.get("embedding")),
+                    similarity=r.get("similarity"),
+                )
+                for r in orjson.loads(fallback_resp.content) or []
+            ]
+        return []
+
+    async def search_hybrid_async(
+        self,
+        query: str,
+        limit: int | None = None,
+        semantic_weight: float | None = None,
+    ) -> list[Chunk]:
+        """Hybrid search combining semantic and keyword search (see KnowledgeBase.search_hybrid)."""
+        embedding = await get_embedding_async(query, client=self._ollama)
+        if not embedding:
+            return []
+
+        limit = limit or self.config.default_match_count
+        semantic_weight = semantic_weight or self.config.semantic_weight
+
+        cache_params = _hybrid_cache_params(
+            self._rest_url, self.config.table_prefix, limit, semantic_weight, query
+        )
+        cached = self._query_cache.lookup(embedding, cache_params)
+        if cached is not None:
+            return _copy_chunks(cached)
+
+        resp = await self._client.post(
+            f"rpc/{self.config.table_prefix}_search_hybrid",
+            content=_dumps({
+                "query_embedding": embedding,
+                "query_text": query,
+                "match_count": limit,
+                "semantic_weight": semantic_weight,
+            }),
+        )
+
+        if resp.status_code == 200:
+            results = [
+                Chunk(
+                    id=r["id"],
+                    source_id=r.get("source_id", ""),
+                    content=r["content"],
+                    chunk_index=r.get("chunk_index", 0),
+                    url=r.get("url"),
+                    title=r.get("title"),
+                    embedding=_as_vector(r.get("embedding")),
+                    similarity=r.get("combined_score"),
+                )
+                for r in orjson.loads(resp.content)
+            ]
+            if results:
+                self._query_cache.insert(embedding, cache_params, tuple(_copy_chunks(results)))
+            return results
+        return []
@@ -20,6 +20,10 @@ class Config:
     ollama_url: str = "http://localhost:11434"
     embedding_model: str = "nomic-embed-text"
     embedding_dimensions: int = 768
+    embedding_cache_size: int = 2048  # Max cached query/chunk embeddings (0 disables)
+    embedding_cache_ttl: float = 600.0  # Seconds before a cached embedding expires
+    embedding_concurrency: int = 8  # Parallel Ollama requests in get_embeddings_batch
+    embedding_batch_size: int = 32  # Texts per /api/embed request
     
     # Chunking
     chunk_size: int = 1000
@@ -29,6 +33,9 @@ class Config:
     default_match_count: int = 10
     similarity_threshold: float = 0.5
     semantic_weight: float = 0.7
+    query_cache_size: int = 256  # Cached search results (0 disables)
+    query_cache_threshold: float = 0.97  # Min cosine similarity for a cache hit
+    query_cache_ttl: float = 120.0  # Seconds before cached search results expire
     
     @classmethod
     def from_env(cls, env_file: str | Path | None = None) -> "Config":
@@ -45,11 +52,18 @@ class Config:
             ollama_url=os.getenv("OLLAMA_URL", "http://localhost:11434"),
             embedding_model=os.getenv("EMBEDDING_MODEL", "nomic-embed-text"),
             embedding_dimensions=int(os.getenv("EMBEDDING_DIMENSIONS", "768")),
+            embedding_cache_size=int(os.getenv("EMBEDDING_CACHE_SIZE", "2048")),
+            embedding_cache_ttl=float(os.getenv("EMBEDDING_CACHE_TTL", "600")),
+            embedding_concurrency=int(os.getenv("EMBEDDING_CONCURRENCY", "8")),
+            embedding_batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", "32")),
             chunk_size=int(os.getenv("CHUNK_SIZE", "1000")),
             chunk_overlap=int(os.getenv("CHUNK_OVERLAP", "200")),
             default_match_count=int(os.getenv("DEFAULT_MATCH_COUNT", "10")),
             similarity_threshold=float(os.getenv("SIMILARITY_THRESHOLD", "0.5")),
             semantic_weight=float(os.getenv("SEMANTIC_WEIGHT", "0.7")),
+            query_cache_size=int(os.getenv("QUERY_CACHE_SIZE", "256")),
+            query_cache_threshold=float(os.getenv("QUERY_CACHE_THRESHOLD", "0.97")),
+            query_cache_ttl=float(os.getenv("QUERY_CACHE_TTL", "120")),
         )
     
     def validate(self) -> list[str]:
@@ -1,10 +1,153 @@
 """Ollama embedding generation for OpenClaw Knowledgebase."""
 
+import asyncio
+import hashlib
+import threading
+import time
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from knowledgebase.config import get_config
 
+# Optional import - httpx powers the async (opt-in) API
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+try:
+    import h2  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+# Truncate long texts (nomic-embed-text has ~2k token limit)
+# Special chars/URLs tokenize heavily, so be very conservative
+MAX_EMBED_CHARS = 3000
+
+
+def _is_embeddable(text: str) -> bool:
+    """Cheap pre-check that rejects empty and whitespace-only texts."""
+    return bool(text) and not text[:MAX_EMBED_CHARS].isspace()
+
+# Max in-flight Ollama requests for the async batch API
+ASYNC_EMBED_CONCURRENCY = 8
+
+# Shared session so repeated Ollama calls reuse keep-alive connections
+_session: requests.Session | None = None
+
+
+def _dumps(data: dict) -> bytes:
+    """Serialize an Ollama request body with orjson."""
+    return orjson.dumps(data)
+
+
+def _get_session() -> requests.Session:
+    """Get the shared requests session for Ollama calls."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.headers["Content-Type"] = "application/json"
+        # Pool must hold one keep-alive socket per batch worker
+        adapter = HTTPAdapter(pool_maxsize=max(get_config().embedding_concurrency, 10))
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+    return _session
+
+
+# Worker pool shared by get_embeddings_batch calls
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the shared embedding thread pool (sized from config on first use)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(get_config().embedding_concurrency, 1),
+                thread_name_prefix="kb-embed",
+            )
+        return _executor
+
+
+class _EmbedCache:
+    """Thread-safe LRU cache with TTL for embeddings, keyed by (model, text).
+
+    Embeddings are stored as tuples and handed out as fresh lists, so callers
+    can't mutate the cached value.
+    """
+
+    def __init__(self, maxsize: int = 2048, ttl: float = 600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[bytes, tuple[float, tuple[float, ...]]] = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model: str, text: str) -> bytes:
+        return hashlib.sha256(f"{model}\0{text}".encode()).digest()
+
+    def get(self, key: bytes) -> list[float] | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, embedding = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return list(embedding)
+
+    def put(self, key: bytes, embedding: list[float]) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, tuple(embedding))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+
+_cache: _EmbedCache | None = None
+
+
+def _get_cache() -> _EmbedCache:
+    """Get the shared embedding cache (sized from config on first use)."""
+    global _cache
+    if _cache is None:
+        config = get_config()
+        _cache = _EmbedCache(config.embedding_cache_size, config.embedding_cache_ttl)
+    return _cache
+
 
 def get_embedding(
     text: str,
@@ -24,60 +167,269 @@ def get_embedding(
     Returns:
         List of floats (embedding vector) or None on error
     """
+    # Reject empty texts before any other work
+    if not _is_embeddable(text):
+        return None
+    
     config = get_config()
     model = model or config.embedding_model
     ollama_url = ollama_url or config.ollama_url
     
-    # Truncate long texts (nomic-embed-text has ~2k token limit)
-    # Special chars/URLs tokenize heavily, so be very conservative
-    max_chars = 3000
-    text = text[:max_chars] if len(text) > max_chars else text
+    # Truncate long texts (see MAX_EMBED_CHARS)
+    text = text[:MAX_EMBED_CHARS] if len(text) > MAX_EMBED_CHARS else text
     
-    if not text.strip():
-        return None
+    cache = _get_cache()
+    cache_key = cache.key(model, text)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
     
     try:
-        response = requests.post(
+        response = _get_session().post(
             f"{ollama_url}/api/embeddings",
-            json={"model": model, "prompt": text},
+            data=_dumps({"model": model, "prompt": text}),
             timeout=timeout,
         )
         response.raise_for_status()
         
-        data = response.json()
+        data = orjson.loads(response.content)
         embedding = data.get("embedding")
-        return embedding if embedding else None
+        if not embedding:
+            return None
+        cache.put(cache_key, embedding)
+        return embedding
         
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError):
         # Log error but don't crash
         return None
 
 
+def _cache_clear() -> None:
+    """Drop all cached embeddings."""
+    _get_cache().clear()
+
+
+def _cache_stats() -> dict:
+    """Return hit/miss counters and size of the embedding cache."""
+    return _get_cache().stats()
+
+
+get_embedding.cache_clear = _cache_clear
+get_embedding.cache_stats = _cache_stats
+
+
+def _embed_group(
+    texts: list[str],
+    model: str,
+    ollama_url: str,
+    timeout: int,
+) -> list[list[float] | None]:
+    """Embed a group of texts with one /api/embed call, per-item on failure."""
+    try:
+        response = _get_session().post(
+            f"{ollama_url}/api/embed",
+            data=_dumps({"model": model, "input": texts}),
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        
+        embeddings = orjson.loads(response.content).get("embeddings") or []
+        if len(embeddings) == len(texts):
+            return [emb if emb else None for emb in embeddings]
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError):
+        pass
+    
+    # Older Ollama or a bad item in the group: fall back to one call per text
+    return [
+        get_embedding(text, model=model, ollama_url=ollama_url, timeout=timeout)
+        for text in texts
+    ]
+
+
 def get_embeddings_batch(
     texts: list[str],
     model: str | None = None,
     ollama_url: str | None = None,
     timeout: int = 300,
+    batch_size: int | None = None,
 ) -> list[list[float] | None]:
     """
     Generate embeddings for multiple texts.
     
-    Note: Ollama doesn't support true batching yet,
-    so this calls the API sequentially.
+    Cache misses are sent to Ollama's /api/embed in groups of
+    `batch_size` texts; groups run concurrently on a shared thread
+    pool (EMBEDDING_CONCURRENCY workers). Results keep input order.
     
     Args:
         texts: List of texts to embed
         model: Ollama model name
         ollama_url: Ollama API URL
-        timeout: Request timeout per embedding
+        timeout: Request timeout per group
+        batch_size: Texts per request (default: from config)
         
     Returns:
         List of embedding vectors (or None for failed embeddings)
     """
-    return [
-        get_embedding(text, model=model, ollama_url=ollama_url, timeout=timeout)
-        for text in texts
-    ]
+    config = get_config()
+    model = model or config.embedding_model
+    ollama_url = ollama_url or config.ollama_url
+    batch_size = max(batch_size or config.embedding_batch_size, 1)
+    cache = _get_cache()
+    
+    results: list[list[float] | None] = [None] * len(texts)
+    # Cache misses by key, so duplicate texts are sent to Ollama only once
+    pending: dict[bytes, tuple[str, list[int]]] = {}
+    
+    for i, text in enumerate(texts):
+        if not _is_embeddable(text):
+            continue
+        text = text[:MAX_EMBED_CHARS] if len(text) > MAX_EMBED_CHARS else text
+        cache_key = cache.key(model, text)
+        if cache_key in pending:
+            pending[cache_key][1].append(i)
+            continue
+        cached = cache.get(cache_key)
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending[cache_key] = (text, [i])
+    
+    items = list(pending.items())
+    groups = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    
+    def embed(group: list[tuple[bytes, tuple[str, list[int]]]]) -> list[list[float] | None]:
+        return _embed_group([text for _, (text, _) in group], model, ollama_url, timeout)
+    
+    if len(groups) == 1:
+        group_results = [embed(groups[0])]
+    else:
+        group_results = _get_executor().map(embed, groups)
+    
+    for group, embeddings in zip(groups, group_results):
+        for (cache_key, (_, indices)), embedding in zip(group, embeddings):
+            if embedding:
+                cache.put(cache_key, embedding)
+                for i in indices:
+                    results[i] = list(embedding)
+    
+    return results
+
+
+def _require_httpx() -> None:
+    """Raise a helpful error if the async extra isn't installed."""
+    if not HAS_HTTPX:
+        raise ImportError(
+            "httpx not installed. Install with: pip install openclaw-knowledgebase[async]"
+        )
+
+
+def _async_client(timeout: float) -> "httpx.AsyncClient":
+    """Create an AsyncClient for Ollama (HTTP/2 when h2 is available)."""
+    _require_httpx()
+    return httpx.AsyncClient(
+        headers={"Content-Type": "application/json"},
+        http2=HAS_HTTP2,
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=ASYNC_EMBED_CONCURRENCY,
+            max_keepalive_connections=ASYNC_EMBED_CONCURRENCY,
+        ),
+    )
+
+
+async def get_embedding_async(
+    text: str,
+    model: str | None = None,
+    ollama_url: str | None = None,
+    timeout: int = 120,
+    client: "httpx.AsyncClient | None" = None,
+) -> list[float] | None:
+    """
+    Async variant of get_embedding (requires httpx).
+    
+    Args:
+        text: Text to embed
+        model: Ollama model name (default: from config)
+        ollama_url: Ollama API URL (default: from config)
+        timeout: Request timeout in seconds
+        client: Optional AsyncClient to reuse (one is created if omitted)
+        
+    Returns:
+        List of floats (embedding vector) or None on error
+    """
+    if not _is_embeddable(text):
+        return None
+    
+    if client is None:
+        async with _async_client(timeout) as own_client:
+            return await get_embedding_async(
+                text, model=model, ollama_url=ollama_url, timeout=timeout, client=own_client
+            )
+    
+    config = get_config()
+    model = model or config.embedding_model
+    ollama_url = ollama_url or config.ollama_url
+    
+    text = text[:MAX_EMBED_CHARS] if len(text) > MAX_EMBED_CHARS else text
+    
+    cache = _get_cache()
+    cache_key = cache.key(model, text)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    try:
+        response = await client.post(
+            f"{ollama_url}/api/embeddings",
+            content=_dumps({"model": model, "prompt": text}),
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        
+        data = orjson.loads(response.content)
+        embedding = data.get("embedding")
+        if not embedding:
+            return None
+        cache.put(cache_key, embedding)
+        return embedding
+        
+    except (httpx.HTTPError, orjson.JSONDecodeError):
+        return None
+
+
+async def get_embeddings_batch_async(
+    texts: list[str],
+    model: str | None = None,
+    ollama_url: str | None = None,
+    timeout: int = 300,
+    concurrency: int = ASYNC_EMBED_CONCURRENCY,
+) -> list[list[float] | None]:
+    """
+    Generate embeddings for multiple texts concurrently (requires httpx).
+    
+    Requests overlap in flight over one shared client; a semaphore caps
+    how many hit Ollama at once.
+    
+    Args:
+        texts: List of texts to embed
+        model: Ollama model name
+        ollama_url: Ollama API URL
+        timeout: Request timeout per embedding
+        concurrency: Max simultaneous Ollama requests
+        
+    Returns:
+        List of embedding vectors in input order (or None for failed embeddings)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async with _async_client(timeout) as client:
+        async def embed_one(text: str) -> list[float] | None:
+            async with semaphore:
+                return await get_embedding_async(
+                    text, model=model, ollama_url=ollama_url, timeout=timeout, client=client
+                )
+        
+        return await asyncio.gather(*(embed_one(text) for text in texts))
 
 
 def test_ollama_connection(ollama_url: str | None = None) -> tuple[bool, str]:
@@ -92,11 +444,11 @@ def test_ollama_connection(ollama_url: str | None = None) -> tuple[bool, str]:
     
     try:
         # Check if Ollama is running
-        response = requests.get(f"{ollama_url}/api/tags", timeout=5)
+        response = _get_session().get(f"{ollama_url}/api/tags", timeout=5)
         response.raise_for_status()
         
         # Check if embedding model is available
-        models = response.json().get("models", [])
+        models = orjson.loads(response.content).get("models", [])
         model_names = [m.get("name", "").split(":")[0] for m in models]
         
         if config.embedding_model not in model_names:
@@ -106,5 +458,5 @@ def test_ollama_connection(ollama_url: str | None = None) -> tuple[bool, str]:
         
     except requests.exceptions.ConnectionError:
         return False, f"Cannot connect to Ollama at {ollama_url}"
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         return False, f"Ollama error: {e}"
@@ -2,7 +2,12 @@
 
 from knowledgebase.ingest.chunker import chunk_text, chunk_markdown, TextChunk
 from knowledgebase.ingest.crawler import crawl_url, crawl_website, crawl_sitemap, CrawledPage
-from knowledgebase.ingest.docling_parser import parse_document, parse_directory, ParsedDocument
+from knowledgebase.ingest.docling_parser import (
+    parse_document,
+    parse_directory,
+    parse_directory_parallel,
+    ParsedDocument,
+)
 
 __all__ = [
     "chunk_text",
@@ -14,5 +19,6 @@ __all__ = [
     "CrawledPage",
     "parse_document",
     "parse_directory",
+    "parse_directory_parallel",
     "ParsedDocument",
 ]
@@ -3,10 +3,17 @@
 import csv
 import io
 import json
+import mmap
 import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterator
+from typing import Callable, Iterator
+
+import orjson
 
 # Optional import - Docling is heavy (ML models)
 try:
@@ -23,7 +30,7 @@ except ImportError:
     HAS_PYPDF = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedDocument:
     """A parsed document."""
     path: str
@@ -58,15 +65,44 @@ def get_supported_formats(include_docling: bool = True) -> set[str]:
     return formats
 
 
-def parse_plain_text(path: Path) -> ParsedDocument:
+# Files at least this big are read through mmap instead of an intermediate bytes copy
+MMAP_THRESHOLD = 1024 * 1024
+
+# Digit runs long enough to be an integer outside orjson's 64-bit range
+_LONG_DIGITS = re.compile(rb"\d{19,}")
+
+
+@contextmanager
+def _mapped_bytes(path: Path, size: int) -> Iterator[bytes | memoryview]:
+    """Yield a file's bytes; large files come as a zero-copy view of an mmap."""
+    if size < MMAP_THRESHOLD:
+        yield path.read_bytes()
+        return
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            yield view
+
+
+def _read_text(path: Path, size: int) -> str:
+    """Read a UTF-8 text file leniently, like Path.read_text(errors="ignore")."""
+    with _mapped_bytes(path, size) as raw:
+        text = str(raw, "utf-8", "ignore")
+    # Universal newlines, as read_text would do
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def parse_plain_text(path: Path, _stat: os.stat_result | None = None) -> ParsedDocument:
     """Parse a plain text file."""
-    content = path.read_text(encoding="utf-8", errors="ignore")
+    size = (_stat or path.stat()).st_size
+    content = _read_text(path, size)
     
     # Try to extract title from first line (for markdown)
     title = None
-    lines = content.split("\n")
-    if lines and lines[0].startswith("# "):
-        title = lines[0][2:].strip()
+    first_line = content.partition("\n")[0]
+    if first_line.startswith("# "):
+        title = first_line[2:].strip()
     
     return ParsedDocument(
         path=str(path),
@@ -74,45 +110,66 @@ def parse_plain_text(path: Path) -> ParsedDocument:
         content=content,
         format=path.suffix.lower().lstrip("."),
         metadata={
-            "size_bytes": path.stat().st_size,
+            "size_bytes": size,
             "filename": path.name,
         },
     )
 
 
+# Escapes "|" inside cells so it doesn't split the markdown column
+_PIPE_ESCAPE = str.maketrans({"|": "\\|"})
+
+
+def _write_markdown_row(out: io.StringIO, row: list[str], width: int) -> None:
+    """Write one CSV row as a markdown table line, padded/cut to `width`."""
+    if len(row) != width:
+        row = (row + [""] * width)[:width]
+    cells = " | ".join(row)
+    # Each separator adds one pipe; any extra comes from a cell and needs escaping
+    if cells.count("|") != width - 1:
+        cells = " | ".join(cell.translate(_PIPE_ESCAPE) for cell in row)
+    out.write("| ")
+    out.write(cells)
+    out.write(" |\n")
+
+
+def _markdown_separator(width: int) -> str:
+    """Header/body separator line for a markdown table."""
+    return "| " + " | ".join(["---"] * width) + " |\n"
+
+
 def parse_csv(path: Path, delimiter: str = ",") -> ParsedDocument:
     """Parse a CSV/TSV file to markdown table."""
-    content = path.read_text(encoding="utf-8", errors="ignore")
-    
     try:
-        reader = csv.reader(io.StringIO(content), delimiter=delimiter)
-        rows = list(reader)
-        
-        if not rows:
-            return ParsedDocument(
-                path=str(path),
-                title=path.stem,
-                content="(empty file)",
-                format="csv",
-                metadata={"filename": path.name, "rows": 0},
-            )
+        # Stream rows straight into the output buffer (no full copy of the file/rows)
+        with path.open("r", encoding="utf-8", errors="ignore", newline="") as f:
+            reader = csv.reader(f, delimiter=delimiter)
+            header = next(reader, None)
+            
+            if header is None:
+                return ParsedDocument(
+                    path=str(path),
+                    title=path.stem,
+                    content="(empty file)",
+                    format="csv",
+                    metadata={"filename": path.name, "rows": 0},
+                )
+            
+            # Convert to markdown table
+            out = io.StringIO()
+            width = len(header)
+            
+            # Header
+            _write_markdown_row(out, header, width)
+            out.write(_markdown_separator(width))
+            
+            # Data rows
+            row_count = 0
+            for row in reader:
+                _write_markdown_row(out, row, width)
+                row_count += 1
         
-        # Convert to markdown table
-        md_lines = []
-        
-        # Header
-        header = rows[0]
-        md_lines.append("| " + " | ".join(header) + " |")
-        md_lines.append("| " + " | ".join(["---"] * len(header)) + " |")
-        
-        # Data rows
-        for row in rows[1:]:
-            # Pad row if needed
-            while len(row) < len(header):
-                row.append("")
-            md_lines.append("| " + " | ".join(row[:len(header)]) + " |")
-        
-        markdown = "\n".join(md_lines)
+        markdown = out.getvalue().rstrip("\n")
         
         return ParsedDocument(
             path=str(path),
@@ -121,8 +178,8 @@ def parse_csv(path: Path, delimiter: str = ",") -> ParsedDocument:
             format="csv" if delimiter == "," else "tsv",
             metadata={
                 "filename": path.name,
-                "rows": len(rows) - 1,
-                "columns": len(header),
+                "rows": row_count,
+                "columns": width,
                 "headers": header,
             },
         )
@@ -131,50 +188,132 @@ def parse_csv(path: Path, delimiter: str = ",") -> ParsedDocument:
         return ParsedDocument(
             path=str(path),
             title=path.stem,
-            content=content,
+            content=path.read_text(encoding="utf-8", errors="ignore"),
             format="csv",
             metadata={"filename": path.name, "parse_error": str(e)},
         )
 
 
-def parse_json(path: Path) -> ParsedDocument:
-    """Parse a JSON file to readable format."""
-    content = path.read_text(encoding="utf-8", errors="ignore")
+def parse_csv_streaming(
+    path: Path,
+    delimiter: str = ",",
+    rows_per_document: int = 10_000,
+) -> Iterator[ParsedDocument]:
+    """
+    Parse a large CSV/TSV file into a series of markdown-table documents.
     
-    try:
-        data = json.loads(content)
+    Each yielded document holds up to `rows_per_document` rows and repeats
+    the header, so the whole table is never held in memory at once.
+    
+    Args:
+        path: Path to CSV/TSV file
+        delimiter: Field delimiter
+        rows_per_document: Max data rows per yielded document
         
-        # Pretty-print JSON as code block
-        formatted = json.dumps(data, indent=2, ensure_ascii=False)
-        markdown = f"```json\n{formatted}\n```"
+    Yields:
+        ParsedDocument objects (metadata carries part number and row range)
+    """
+    fmt = "csv" if delimiter == "," else "tsv"
+    
+    with path.open("r", encoding="utf-8", errors="ignore", newline="") as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
         
-        # Try to extract title from common fields
-        title = None
-        if isinstance(data, dict):
-            title = data.get("title") or data.get("name") or data.get("id")
+        width = len(header)
+        header_out = io.StringIO()
+        _write_markdown_row(header_out, header, width)
+        header_md = header_out.getvalue() + _markdown_separator(width)
         
-        return ParsedDocument(
-            path=str(path),
-            title=str(title) if title else path.stem,
-            content=markdown,
-            format="json",
-            metadata={
-                "filename": path.name,
-                "type": type(data).__name__,
-                "size_bytes": path.stat().st_size,
-            },
-        )
-    except json.JSONDecodeError as e:
-        return ParsedDocument(
-            path=str(path),
-            title=path.stem,
-            content=content,
-            format="json",
-            metadata={"filename": path.name, "parse_error": str(e)},
-        )
+        part = 0
+        first_row = 0
+        out = io.StringIO()
+        row_count = 0
+        
+        def make_document() -> ParsedDocument:
+            return ParsedDocument(
+                path=str(path),
+                title=f"{path.stem} (part {part + 1})",
+                content=header_md + out.getvalue().rstrip("\n"),
+                format=fmt,
+                metadata={
+                    "filename": path.name,
+                    "part": part,
+                    "first_row": first_row,
+                    "rows": row_count,
+                    "columns": width,
+                    "headers": header,
+                },
+            )
+        
+        for row in reader:
+            _write_markdown_row(out, row, width)
+            row_count += 1
+            if row_count >= rows_per_document:
+                yield make_document()
+                part += 1
+                first_row += row_count
+                out = io.StringIO()
+                row_count = 0
+        
+        if row_count or part == 0:
+            yield make_document()
 
 
-def parse_pdf_with_pypdf(path: Path) -> ParsedDocument | None:
+def parse_json(path: Path, _stat: os.stat_result | None = None) -> ParsedDocument:
+    """Parse a JSON file to readable format."""
+    size = (_stat or path.stat()).st_size
+    
+    with _mapped_bytes(path, size) as raw:
+        # orjson parses straight from the (possibly mmapped) buffer, but rounds
+        # integers beyond 64 bits to floats, so leave those files to json
+        use_orjson = _LONG_DIGITS.search(raw) is None
+        if use_orjson:
+            try:
+                data = orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                use_orjson = False
+        if not use_orjson:
+            # json also accepts NaN/Infinity and 1e400, and skips invalid UTF-8
+            text = str(raw, "utf-8", "ignore")
+            try:
+                data = json.loads(text)
+            except json.JSONDecodeError as e:
+                return ParsedDocument(
+                    path=str(path),
+                    title=path.stem,
+                    content=text,
+                    format="json",
+                    metadata={"filename": path.name, "parse_error": str(e)},
+                )
+    
+    # Pretty-print JSON as code block
+    if use_orjson:
+        formatted = orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    else:
+        formatted = json.dumps(data, indent=2, ensure_ascii=False)
+    markdown = f"```json\n{formatted}\n```"
+    
+    # Try to extract title from common fields
+    title = None
+    if isinstance(data, dict):
+        title = data.get("title") or data.get("name") or data.get("id")
+    
+    return ParsedDocument(
+        path=str(path),
+        title=str(title) if title else path.stem,
+        content=markdown,
+        format="json",
+        metadata={
+            "filename": path.name,
+            "type": type(data).__name__,
+            "size_bytes": size,
+        },
+    )
+
+
+def parse_pdf_with_pypdf(path: Path, _stat: os.stat_result | None = None) -> ParsedDocument | None:
     """Parse a PDF using pypdf (lightweight fallback)."""
     if not HAS_PYPDF:
         return None
@@ -204,7 +343,7 @@ def parse_pdf_with_pypdf(path: Path) -> ParsedDocument | None:
             metadata={
                 "filename": path.name,
                 "pages": len(reader.pages),
-                "size_bytes": path.stat().st_size,
+                "size_bytes": (_stat or path.stat()).st_size,
                 "parser": "pypdf",
             },
         )
@@ -218,14 +357,39 @@ def parse_pdf_with_pypdf(path: Path) -> ParsedDocument | None:
         )
 
 
-def parse_with_docling(path: Path) -> ParsedDocument | None:
+# Docling loads its OCR/layout models when a converter is built, so keep one per process
+_converter: "DocumentConverter | None" = None
+_converter_lock = threading.Lock()
+
+
+def _get_converter() -> "DocumentConverter":
+    """Get the process-wide DocumentConverter, creating it on first use."""
+    global _converter
+    if _converter is None:
+        with _converter_lock:
+            if _converter is None:
+                _converter = DocumentConverter()
+    return _converter
+
+
+def _init_docling_worker() -> None:
+    """ProcessPoolExecutor initializer: load the Docling models up front."""
+    if HAS_DOCLING:
+        try:
+            _get_converter()
+        except Exception:
+            # A failing initializer breaks the whole pool; let
+            # parse_with_docling report the error per document instead
+            pass
+
+
+def parse_with_docling(path: Path, _stat: os.stat_result | None = None) -> ParsedDocument | None:
     """Parse a document using Docling (PDF, DOCX, XLSX, PPTX, HTML)."""
     if not HAS_DOCLING:
         return None
     
     try:
-        converter = DocumentConverter()
-        result = converter.convert(str(path))
+        result = _get_converter().convert(str(path))
         
         # Export to markdown
         content = result.document.export_to_markdown()
@@ -233,7 +397,7 @@ def parse_with_docling(path: Path) -> ParsedDocument | None:
         # Get metadata
         metadata = {
             "filename": path.name,
-            "size_bytes": path.stat().st_size,
+            "size_bytes": (_stat or path.stat()).st_size,
         }
         
         # Try to get title from document metadata
@@ -260,7 +424,41 @@ def parse_with_docling(path: Path) -> ParsedDocument | None:
         )
 
 
-def parse_document(path: str | Path) -> ParsedDocument | None:
+# Parser signature used by the dispatch table: (path, cached stat or None)
+_Parser = Callable[[Path, os.stat_result | None], ParsedDocument | None]
+
+
+def _unsupported(path: Path, _stat: os.stat_result | None = None) -> None:
+    """Parser for Docling formats when neither Docling nor a fallback is available."""
+    return None
+
+
+def _build_dispatch() -> dict[str, _Parser]:
+    """Map each known suffix to its parser (resolved once, at import)."""
+    dispatch: dict[str, _Parser] = {ext: parse_plain_text for ext in NATIVE_TEXT_FORMATS}
+    dispatch[".csv"] = lambda path, _stat: parse_csv(path, delimiter=",")
+    dispatch[".tsv"] = lambda path, _stat: parse_csv(path, delimiter="\t")
+    dispatch[".json"] = parse_json
+    
+    for ext in DOCLING_FORMATS:
+        if HAS_DOCLING:
+            # Docling first (best quality)
+            dispatch[ext] = parse_with_docling
+        elif ext == ".pdf" and HAS_PYPDF:
+            # Fallback for PDFs: use pypdf
+            dispatch[ext] = parse_pdf_with_pypdf
+        elif ext in {".html", ".htm"}:
+            # Fallback: read HTML as text
+            dispatch[ext] = parse_plain_text
+        else:
+            dispatch[ext] = _unsupported
+    return dispatch
+
+
+_DISPATCH = _build_dispatch()
+
+
+def parse_document(path: str | Path, _stat: os.stat_result | None = None) -> ParsedDocument | None:
     """
     Parse a document file.
     
@@ -274,68 +472,55 @@ def parse_document(path: str | Path) -> ParsedDocument | None:
     
     Args:
         path: Path to document
+        _stat: Cached stat result (e.g. from os.scandir), saves a stat call
         
     Returns:
         ParsedDocument or None on error
     """
     path = Path(path)
     
-    if not path.exists():
-        return None
-    
-    suffix = path.suffix.lower()
-    
-    # CSV/TSV
-    if suffix == ".csv":
+    if _stat is None:
         try:
-            return parse_csv(path, delimiter=",")
-        except Exception:
+            _stat = path.stat()
+        except OSError:
             return None
     
-    if suffix == ".tsv":
-        try:
-            return parse_csv(path, delimiter="\t")
-        except Exception:
-            return None
-    
-    # JSON
-    if suffix == ".json":
-        try:
-            return parse_json(path)
-        except Exception:
-            return None
+    # Unknown formats are tried as plain text
+    parser = _DISPATCH.get(path.suffix.lower(), parse_plain_text)
+    try:
+        return parser(path, _stat)
+    except Exception:
+        return None
+
+
+def _iter_directory_files(
+    directory: Path,
+    recursive: bool,
+    extensions: set[str] | None,
+) -> Iterator[tuple[Path, os.stat_result]]:
+    """Yield (path, stat) for files in `directory` whose extension is in `extensions`.
     
-    # Plain text formats
-    if suffix in NATIVE_TEXT_FORMATS:
-        try:
-            return parse_plain_text(path)
-        except Exception:
-            return None
+    Walks with os.scandir, so file-type checks come from the directory entry
+    and each file is stat'ed once; the stat is handed on to the parsers.
+    """
+    extensions = extensions or get_supported_formats()
     
-    # Docling formats
-    if suffix in DOCLING_FORMATS:
-        # Try Docling first (best quality)
-        if HAS_DOCLING:
-            return parse_with_docling(path)
-        
-        # Fallback for PDFs: use pypdf
-        if suffix == ".pdf" and HAS_PYPDF:
-            return parse_pdf_with_pypdf(path)
-        
-        # Fallback: try to read as text for HTML
-        if suffix in {".html", ".htm"}:
-            try:
-                return parse_plain_text(path)
-            except:
-                pass
-        
-        return None
+    # Normalize extensions
+    extensions = {ext.lower().lstrip(".") for ext in extensions}
     
-    # Unknown format - try plain text
-    try:
-        return parse_plain_text(path)
-    except:
-        return None
+    pending = [directory]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        suffix = os.path.splitext(entry.name)[1].lower().lstrip(".")
+                        if suffix in extensions:
+                            yield Path(entry.path), entry.stat()
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+        except OSError:
+            continue
 
 
 def parse_directory(
@@ -359,44 +544,103 @@ def parse_directory(
     if not directory.is_dir():
         return
     
-    extensions = extensions or get_supported_formats()
+    for path, stat in _iter_directory_files(directory, recursive, extensions):
+        doc = parse_document(path, stat)
+        if doc:
+            yield doc
+
+
+def parse_directory_parallel(
+    directory: str | Path,
+    recursive: bool = True,
+    extensions: set[str] | None = None,
+    workers: int | None = None,
+    chunksize: int = 4,
+) -> Iterator[ParsedDocument]:
+    """
+    Parse all documents in a directory, running Docling formats in a process pool.
     
-    # Normalize extensions
-    extensions = {ext.lower().lstrip(".") for ext in extensions}
+    Native text formats are cheap and parsed in-process; only Docling formats
+    (PDF, Office, HTML) are sent to worker processes, where the CPU-heavy
+    models run in parallel. Native documents are yielded first, then the
+    Docling ones in directory order.
     
-    pattern = "**/*" if recursive else "*"
+    Args:
+        directory: Directory path
+        recursive: Search subdirectories
+        extensions: File extensions to include (default: all supported)
+        workers: Worker processes (default: os.cpu_count())
+        chunksize: Files handed to a worker at a time
+        
+    Yields:
+        ParsedDocument objects
+    """
+    directory = Path(directory)
+    
+    if not directory.is_dir():
+        return
+    
+    native_files: list[tuple[Path, os.stat_result]] = []
+    heavy_files: list[tuple[Path, os.stat_result]] = []
+    for path, stat in _iter_directory_files(directory, recursive, extensions):
+        if HAS_DOCLING and path.suffix.lower() in DOCLING_FORMATS:
+            heavy_files.append((path, stat))
+        else:
+            native_files.append((path, stat))
+    
+    if not heavy_files:
+        for path, stat in native_files:
+            doc = parse_document(path, stat)
+            if doc:
+                yield doc
+        return
     
-    for path in directory.glob(pattern):
-        if path.is_file():
-            suffix = path.suffix.lower().lstrip(".")
-            if suffix in extensions:
-                doc = parse_document(path)
-                if doc:
-                    yield doc
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        initializer=_init_docling_worker,
+    ) as executor:
+        # Start the workers before the in-process pass so both overlap
+        heavy_docs = executor.map(
+            parse_document,
+            [path for path, _ in heavy_files],
+            [stat for _, stat in heavy_files],
+            chunksize=chunksize,
+        )
+        
+        for path, stat in native_files:
+            doc = parse_document(path, stat)
+            if doc:
+                yield doc
+        
+        for doc in heavy_docs:
+            if doc:
+                yield doc
+
+
+# Parse cost per suffix: (seconds per MB, fixed seconds e.g. model loading)
+_PARSE_COST: dict[str, tuple[float, float]] = {
+    **{ext: (0.1, 0.0) for ext in NATIVE_TEXT_FORMATS},  # Very fast
+    ".pdf": (3.0, 2.0),  # PDFs are slow, plus model loading
+    ".docx": (1.5, 1.0),
+    ".doc": (1.5, 1.0),
+    ".pptx": (2.0, 1.0),
+    ".ppt": (2.0, 1.0),
+    ".xlsx": (1.5, 1.0),
+    ".xls": (1.5, 1.0),
+}
+_DEFAULT_PARSE_COST = (0.5, 0.0)
 
 
 def estimate_parse_time(path: str | Path) -> float:
     """Estimate parsing time in seconds based on file size and type."""
     path = Path(path)
-    if not path.exists():
+    try:
+        size_mb = path.stat().st_size / (1024 * 1024)
+    except OSError:
         return 0
     
-    size_mb = path.stat().st_size / (1024 * 1024)
-    suffix = path.suffix.lower()
-    
-    # Base estimates (seconds per MB)
-    if suffix in NATIVE_TEXT_FORMATS:
-        return size_mb * 0.1  # Very fast
-    elif suffix == ".pdf":
-        return size_mb * 3.0 + 2.0  # PDFs are slow, plus model loading
-    elif suffix in {".docx", ".doc"}:
-        return size_mb * 1.5 + 1.0
-    elif suffix in {".pptx", ".ppt"}:
-        return size_mb * 2.0 + 1.0
-    elif suffix in {".xlsx", ".xls"}:
-        return size_mb * 1.5 + 1.0
-    else:
-        return size_mb * 0.5
+    per_mb, base = _PARSE_COST.get(path.suffix.lower(), _DEFAULT_PARSE_COST)
+    return size_mb * per_mb + base
 
 
 # Format descriptions for UI
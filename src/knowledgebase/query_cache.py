@@ -0,0 +1,176 @@
+"""Proximity cache for search results in OpenClaw Knowledgebase.
+
+Maps query embeddings to the results they produced. A new query whose
+embedding has cosine similarity >= tau with a cached one (for the same
+search parameters) gets the cached results back without hitting Supabase.
+Entries expire after a TTL, since writes from other processes (CLI embed
+runs, the auto-indexer) can't invalidate this process's cache.
+"""
+
+import threading
+import time
+from typing import Any, Hashable, Sequence
+
+import numpy as np
+
+from knowledgebase.config import get_config
+
+
+class _ProximityCache:
+    """Thread-safe LRU cache of (query embedding, params) -> search results.
+
+    Embeddings live as unit-length rows of one contiguous matrix, so a lookup
+    is a single matrix-vector product instead of a Python loop. Rows are
+    quantized to int8 with a per-row scale (127 / max|x|), a quarter of the
+    float32 footprint; the similarity error (~1e-3) is far below the gap
+    between tau and unrelated queries.
+    """
+
+    def __init__(self, capacity: int = 256, tau: float = 0.97, ttl: float = 120.0):
+        self.capacity = capacity
+        self.tau = tau
+        self.ttl = ttl
+        self._mat: np.ndarray | None = None  # (capacity, dim) int8, allocated on first insert
+        self._scales = np.ones(max(capacity, 0), dtype=np.float32)
+        self._param_ids = np.full(max(capacity, 0), -1, dtype=np.int32)
+        self._last_used = np.zeros(max(capacity, 0), dtype=np.int64)
+        self._expires_at = np.zeros(max(capacity, 0), dtype=np.float64)
+        self._results: list[Any] = [None] * max(capacity, 0)
+        # params <-> small int ids; an id is dropped once no row uses it
+        self._param_index: dict[Hashable, int] = {}
+        self._param_keys: dict[int, Hashable] = {}
+        self._next_pid = 0
+        self._size = 0
+        self._tick = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> np.ndarray | None:
+        q = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        if q.ndim != 1 or norm == 0:
+            return None
+        return q / norm
+
+    @staticmethod
+    def _quantize(q: np.ndarray) -> tuple[np.ndarray, np.float32]:
+        """Quantize a unit vector to int8, returning (values, scale)."""
+        scale = np.float32(127.0) / np.abs(q).max()
+        return np.round(q * scale).astype(np.int8), scale
+
+    def lookup(self, embedding: Sequence[float], params: Hashable) -> Any | None:
+        """Return cached results for a near-identical query, or None."""
+        if self.capacity <= 0:
+            return None
+        q = self._normalize(embedding)
+        if q is None:
+            return None
+
+        with self._lock:
+            pid = self._param_index.get(params)
+            if pid is None or self._size == 0 or self._mat.shape[1] != q.shape[0]:
+                self.misses += 1
+                return None
+
+            # Rows are unit length, so cosine == dot product (int32 accumulator)
+            q_i8, q_scale = self._quantize(q)
+            dots = np.matmul(self._mat[:self._size], q_i8, dtype=np.int32)
+            sims = dots / (self._scales[:self._size] * q_scale)
+            sims[self._param_ids[:self._size] != pid] = -np.inf
+            sims[self._expires_at[:self._size] < time.monotonic()] = -np.inf
+            idx = int(sims.argmax())
+            if sims[idx] < self.tau:
+                self.misses += 1
+                return None
+
+            self._tick += 1
+            self._last_used[idx] = self._tick
+            self.hits += 1
+            return self._results[idx]
+
+    def insert(self, embedding: Sequence[float], params: Hashable, results: Any) -> None:
+        """Cache results for a query, evicting the least recently used entry."""
+        if self.capacity <= 0:
+            return
+        q = self._normalize(embedding)
+        if q is None:
+            return
+
+        with self._lock:
+            if self._mat is None or self._mat.shape[1] != q.shape[0]:
+                # First insert (or the embedding model changed): (re)allocate
+                self._mat = np.zeros((self.capacity, q.shape[0]), dtype=np.int8)
+                self._reset()
+
+            now = time.monotonic()
+            if self._size < self.capacity:
+                row = self._size
+                self._size += 1
+            else:
+                # Reuse an expired row if there is one, else the least recently used
+                expired = self._expires_at < now
+                row = int(expired.argmax()) if expired.any() else int(self._last_used.argmin())
+
+            pid = self._param_index.get(params)
+            if pid is None:
+                pid = self._next_pid
+                self._next_pid += 1
+                self._param_index[params] = pid
+                self._param_keys[pid] = params
+
+            old_pid = int(self._param_ids[row])
+            self._tick += 1
+            self._mat[row], self._scales[row] = self._quantize(q)
+            self._param_ids[row] = pid
+            self._last_used[row] = self._tick
+            self._expires_at[row] = now + self.ttl
+            self._results[row] = results
+
+            if old_pid not in (-1, pid) and not (self._param_ids[:self._size] == old_pid).any():
+                del self._param_index[self._param_keys.pop(old_pid)]
+
+    def _reset(self) -> None:
+        self._param_ids.fill(-1)
+        self._last_used.fill(0)
+        self._expires_at.fill(0.0)
+        self._scales.fill(1.0)
+        self._results = [None] * self.capacity
+        self._param_index.clear()
+        self._param_keys.clear()
+        self._size = 0
+
+    def clear(self) -> None:
+        """Drop all cached results (call after the indexed data changes)."""
+        with self._lock:
+            self._reset()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": self._size,
+                "capacity": self.capacity,
+                "tau": self.tau,
+                "ttl": self.ttl,
+            }
+
+
+_query_cache: _ProximityCache | None = None
+
+
+def get_query_cache() -> _ProximityCache:
+    """Get the process-wide query cache (sized from config on first use).
+
+    Shared by all KnowledgeBase instances, so a write through any of them
+    invalidates results cached by the others.
+    """
+    global _query_cache
+    if _query_cache is None:
+        config = get_config()
+        _query_cache = _ProximityCache(
+            config.query_cache_size, config.query_cache_threshold, config.query_cache_ttl
+        )
+    return _query_cache
@@ -715,13 +715,14 @@ def run_crawl_job(job_id: str, url: str, max_depth: int, title: str | None, tags
         chunks_to_embed = kb.get_chunks_without_embeddings(limit=2000, source_id=source.id)
         embedded = 0
         embed_errors = 0
+        updates = []
         
         for chunk in chunks_to_embed:
             for attempt in range(3):
                 try:
                     embedding = get_embedding(chunk.content)
                     if embedding:
-                        kb.update_chunk_embedding(chunk.id, embedding)
+                        updates.append((chunk.id, embedding))
                         embedded += 1
                     break
                 except Exception as e:
@@ -738,6 +739,9 @@ def run_crawl_job(job_id: str, url: str, max_depth: int, title: str | None, tags
                 time.sleep(0.5)
                 job["current"] = f"Generating embeddings... {embedded} done"
         
+        job["current"] = "Saving embeddings..."
+        kb.update_chunk_embeddings_batch(updates)
+        
         job["status"] = "completed"
         job["result"] = {
             "source_id": source.id,
@@ -804,13 +808,14 @@ def run_upload_job(job_id: str, file_path: str, title: str, tags: list[str] | No
         job["current"] = "Generating embeddings..."
         chunks_to_embed = kb.get_chunks_without_embeddings(limit=2000, source_id=source.id)
         embedded = 0
+        updates = []
         
         for chunk in chunks_to_embed:
             for attempt in range(3):
                 try:
                     embedding = get_embedding(chunk.content)
                     if embedding:
-                        kb.update_chunk_embedding(chunk.id, embedding)
+                        updates.append((chunk.id, embedding))
                         embedded += 1
                     break
                 except Exception:
@@ -823,6 +828,9 @@ def run_upload_job(job_id: str, file_path: str, title: str, tags: list[str] | No
                 time.sleep(0.5)
                 job["current"] = f"Generating embeddings... {embedded} done"
         
+        job["current"] = "Saving embeddings..."
+        kb.update_chunk_embeddings_batch(updates)
+        
         job["status"] = "completed"
         job["result"] = {
             "source_id": source.id,
@@ -928,14 +936,15 @@ def run_refresh_job(job_id: str, source_id: str, url: str, title: str | None):
         # Generate embeddings
         job["current"] = "Generating embeddings..."
         chunks_to_embed = kb.get_chunks_without_embeddings(limit=500)
-        embedded = 0
+        updates = []
         
         for chunk in chunks_to_embed:
             if str(chunk.source_id) == str(source_id):
                 embedding = get_embedding(chunk.content)
                 if embedding:
-                    kb.update_chunk_embedding(chunk.id, embedding)
-                    embedded += 1
+                    updates.append((chunk.id, embedding))
+        
+        embedded = kb.update_chunk_embeddings_batch(updates)
         
         job["status"] = "completed"
         job["result"] = {
@@ -958,28 +967,30 @@ def run_embed_job(job_id: str):
     try:
         kb = KnowledgeBase()
         
-        # Get pending chunks
-        chunks = kb.get_chunks_without_embeddings(limit=500)
-        job["total"] = len(chunks)
+        # Count pending chunks
+        total = kb.count_chunks(with_embeddings=False)
+        job["total"] = total
         job["progress"] = 0
         
-        if not chunks:
+        if not total:
             job["status"] = "completed"
             job["result"] = {"embedded": 0, "message": "No pending chunks"}
             return
         
+        # Embed in batches (identical texts once); skip chunks that fail so the loop ends
         embedded = 0
-        for i, chunk in enumerate(chunks):
-            job["progress"] = i + 1
-            job["current"] = f"Chunk {i + 1}/{len(chunks)}"
-            
-            embedding = get_embedding(chunk.content)
-            if embedding:
-                kb.update_chunk_embedding(chunk.id, embedding)
-                embedded += 1
+        skipped: set = set()
+        while True:
+            done, failed = kb.embed_pending(batch_size=100, skip_ids=skipped)
+            if not done and not failed:
+                break
+            embedded += done
+            skipped.update(failed)
+            job["progress"] = min(embedded + len(skipped), total)
+            job["current"] = f"Chunk {job['progress']}/{total}"
         
         job["status"] = "completed"
-        job["result"] = {"embedded": embedded, "total": len(chunks)}
+        job["result"] = {"embedded": embedded, "failed": len(skipped), "total": total}
         
     except Exception as e:
         job["status"] = "error"